@@ -4,12 +4,20 @@ Using Official Endee Python SDK
 
 This script:
 1. Loads remedy chunks from remedy_chunks.json
-2. Generates embeddings using all-MiniLM-L6-v2
+2. Generates embeddings using all-MiniLM-L6-v2 and writes the local side
+   files (full texts, embedding cache)
 3. Creates an index in Endee
 4. Upserts vectors with metadata
+
+Run it on the host: the backend container mounts data/ read-only.
 """
 
 import json
+import time
+import hashlib
+import re
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from sentence_transformers import SentenceTransformer
 from endee import Endee, Precision
 from tqdm import tqdm
@@ -17,10 +25,18 @@ import os
 
 # Configuration
 CHUNKS_FILE = "data/remedy_chunks.json"
+FULL_TEXTS_FILE = "data/full_texts.json"
 INDEX_NAME = "homeopathy_remedies"
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# Cached vectors are only valid for the model that produced them
+EMBEDDINGS_CACHE_FILE = f"data/embeddings_{EMBEDDING_MODEL.replace('/', '__')}.npz"
+# IDs written since vector IDs became content hashes
+HASH_ID_PATTERN = re.compile(r"^chunk_[0-9a-f]{16}$")
 EMBEDDING_DIMENSION = 384
 BATCH_SIZE = 50
+UPSERT_WORKERS = 8
+UPSERT_RETRIES = 3
+UPSERT_BACKOFF_SECONDS = 0.5  # doubled after each failed attempt
 
 print("="*80)
 print("HOMEOPATHY REMEDY INGESTION TO ENDEE")
@@ -52,6 +68,14 @@ except Exception as e:
     print(f"ERROR: Failed to load chunks: {e}")
     exit(1)
 
+# Side files are written before the index is touched, so fail now rather
+# than after an existing index has been deleted
+data_dir = os.path.dirname(FULL_TEXTS_FILE) or "."
+if not os.access(data_dir, os.W_OK):
+    print(f"ERROR: {data_dir} is not writable")
+    print("  Run ingestion on the host; the backend container mounts data/ read-only")
+    exit(1)
+
 # Step 3: Initialize embedding model
 print(f"\n[3] Loading embedding model: {EMBEDDING_MODEL}...")
 try:
@@ -61,8 +85,106 @@ except Exception as e:
     print(f"ERROR: Failed to load model: {e}")
     exit(1)
 
-# Step 4: Create index in Endee
-print(f"\n[4] Creating index '{INDEX_NAME}' in Endee...")
+# IDs upserted by the previous run, used to remove vectors for chunks that no longer exist
+previous_full_texts = None
+if os.path.exists(FULL_TEXTS_FILE):
+    with open(FULL_TEXTS_FILE, 'r', encoding='utf-8') as f:
+        previous_full_texts = json.load(f)
+previous_ids = set(previous_full_texts) if previous_full_texts is not None else None
+
+
+def write_full_texts(texts):
+    """Write the id -> full text side file read by the backend"""
+    with open(FULL_TEXTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(texts, f, ensure_ascii=False)
+
+# Step 4: Generate embeddings and prepare vectors
+print(f"\n[4] Generating embeddings for {len(chunks)} hybrid chunks...")
+vectors_to_upsert = []
+full_texts = {}
+
+
+def chunk_hash(text):
+    """Content hash of a chunk, used as its cache key and vector ID"""
+    return hashlib.blake2b(text.encode('utf-8')).hexdigest()[:16]
+
+
+try:
+    hashes = [chunk_hash(chunk['text']) for chunk in chunks]
+    
+    # Reuse embeddings from previous runs for chunks whose text is unchanged
+    embedding_cache = {}
+    if os.path.exists(EMBEDDINGS_CACHE_FILE):
+        with np.load(EMBEDDINGS_CACHE_FILE) as cached:
+            embedding_cache = {h: cached[h] for h in cached.files}
+        print(f"  Loaded {len(embedding_cache)} cached embeddings from {EMBEDDINGS_CACHE_FILE}")
+    
+    # Drop embeddings of chunks that are no longer in the corpus
+    current_hashes = set(hashes)
+    pruned = len(embedding_cache)
+    embedding_cache = {h: e for h, e in embedding_cache.items() if h in current_hashes}
+    pruned -= len(embedding_cache)
+    
+    missing = {}
+    for chunk, h in zip(chunks, hashes):
+        if h not in embedding_cache:
+            missing.setdefault(h, chunk['text'])
+    print(f"  {len(missing)} chunks need encoding")
+    
+    if missing:
+        # Encode all missing chunks in one batched call instead of one forward pass per chunk
+        embeddings = model.encode(
+            list(missing.values()),
+            batch_size=64,
+            normalize_embeddings=True,
+            show_progress_bar=True,
+            convert_to_numpy=True
+        )
+        embedding_cache.update(zip(missing.keys(), embeddings))
+    if missing or pruned:
+        np.savez(EMBEDDINGS_CACHE_FILE, **embedding_cache)
+
+    for chunk, h in zip(chunks, hashes):
+        # Content-addressed ID: re-ingesting unchanged text upserts the same vector
+        vector_id = f"chunk_{h}"
+        if vector_id in full_texts:
+            # Duplicate text, already queued
+            continue
+        
+        # Prepare vector data for Endee
+        vector_data = {
+            "id": vector_id,
+            "vector": embedding_cache[h].tolist(),
+            "meta": {
+                "remedy_name": chunk['remedy_name'],
+                "remedy_index": chunk.get('remedy_index', 0),
+                "text_preview": chunk['text'][:300] + "..."
+            },
+            "filter": {
+                "remedy_name": chunk['remedy_name'],
+                "chunk_type": chunk.get('chunk_type', "flat_window")
+            }
+        }
+        
+        vectors_to_upsert.append(vector_data)
+        # Full text is kept out of Endee and served by the backend from disk
+        full_texts[vector_id] = chunk['text']
+    
+    # Keep the previous IDs listed until their vectors are removed from Endee,
+    # so a failed run can still clean them up next time
+    write_full_texts({**(previous_full_texts or {}), **full_texts})
+    
+    print(f"DONE: Generated {len(vectors_to_upsert)} embeddings")
+    print(f"DONE: Wrote full texts to {FULL_TEXTS_FILE}")
+    
+except Exception as e:
+    print(f"ERROR: Failed to generate embeddings: {e}")
+    exit(1)
+
+# Step 5: Create index in Endee
+print(f"\n[5] Creating index '{INDEX_NAME}' in Endee...")
+# Stale vectors are only removed from a kept index with a content-hash manifest
+clean_stale = False
 try:
     # Check if index already exists
     indexes_response = client.list_indexes()
@@ -71,12 +193,21 @@ try:
     
     if INDEX_NAME in existing_names:
         print(f"  WARNING: Index '{INDEX_NAME}' already exists")
+        stale_format = previous_ids is None or not all(HASH_ID_PATTERN.match(i) for i in previous_ids)
+        if stale_format:
+            # Without a content-hash manifest we cannot tell which vectors are stale
+            print(f"  WARNING: No content-hash ID manifest at {FULL_TEXTS_FILE}")
+            print("  Keeping the index will leave orphan vectors from earlier runs (e.g. chunk_<idx> IDs)")
+            print("  in search results; recreate it to remove them")
         user_input = input("  Delete and recreate? (y/n): ")
         if user_input.lower() == 'y':
             client.delete_index(name=INDEX_NAME)
             print(f"  DONE: Deleted existing index")
         else:
+            clean_stale = not stale_format
             print("  Using existing index")
+            if stale_format:
+                print("  Skipping stale vector cleanup")
     
     # Create new index if it doesn't exist
     indexes_response = client.list_indexes()
@@ -102,52 +233,46 @@ except Exception as e:
     print(f"ERROR: Failed to create index: {e}")
     exit(1)
 
-# Step 5: Generate embeddings and prepare vectors
-print(f"\n[5] Generating embeddings for {len(chunks)} hybrid chunks...")
-vectors_to_upsert = []
+# Step 6: Upsert vectors to Endee in batches
+print(f"\n[6] Upserting vectors to Endee (batch size: {BATCH_SIZE}, workers: {UPSERT_WORKERS})...")
+
+
+def upsert_batch(batch_num, batch):
+    """Upsert one batch, retrying with exponential backoff before giving up"""
+    for attempt in range(1, UPSERT_RETRIES + 1):
+        try:
+            index.upsert(batch)
+            return len(batch)
+        except Exception as e:
+            print(f"  WARNING: Batch {batch_num} attempt {attempt}/{UPSERT_RETRIES} failed: {e}")
+            if attempt == UPSERT_RETRIES:
+                raise
+            time.sleep(UPSERT_BACKOFF_SECONDS * 2 ** (attempt - 1))
 
-try:
-    for idx, chunk in enumerate(tqdm(chunks, desc="Generating embeddings")):
-        # Generate embedding
-        embedding = model.encode(chunk['text'], normalize_embeddings=True)
-        
-        # Prepare vector data for Endee
-        # Use a unique ID: chunk_{idx} to prevent collisions
-        vector_data = {
-            "id": f"chunk_{idx}",
-            "vector": embedding.tolist(),
-            "meta": {
-                "remedy_name": chunk['remedy_name'],
-                "remedy_index": chunk.get('remedy_index', 0),
-                "text_preview": chunk['text'][:300] + "...",
-                "full_text": chunk['text']
-            },
-            "filter": {
-                "remedy_name": chunk['remedy_name'],
-                "chunk_type": chunk.get('chunk_type', "flat_window")
-            }
-        }
-        
-        vectors_to_upsert.append(vector_data)
-    
-    print(f"DONE: Generated {len(vectors_to_upsert)} embeddings")
-    
-except Exception as e:
-    print(f"ERROR: Failed to generate embeddings: {e}")
-    exit(1)
 
-# Step 6: Upsert vectors to Endee in batches
-print(f"\n[6] Upserting vectors to Endee (batch size: {BATCH_SIZE})...")
 try:
-    total_batches = (len(vectors_to_upsert) + BATCH_SIZE - 1) // BATCH_SIZE
+    batches = [
+        vectors_to_upsert[i:i + BATCH_SIZE]
+        for i in range(0, len(vectors_to_upsert), BATCH_SIZE)
+    ]
+    failed_batches = []
     
-    for i in range(0, len(vectors_to_upsert), BATCH_SIZE):
-        batch = vectors_to_upsert[i:i + BATCH_SIZE]
-        batch_num = (i // BATCH_SIZE) + 1
-        
-        print(f"  Batch {batch_num}/{total_batches}: Upserting {len(batch)} vectors...")
-        index.upsert(batch)
-        # No need to print "✓ Batch completed" every time for large uploads, looks cleaner
+    # Upserts are I/O-bound HTTP calls, so overlap them with a thread pool
+    with ThreadPoolExecutor(max_workers=UPSERT_WORKERS) as pool:
+        futures = {
+            pool.submit(upsert_batch, batch_num, batch): batch_num
+            for batch_num, batch in enumerate(batches, 1)
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Upserting batches"):
+            batch_num = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  ERROR: Batch {batch_num}/{len(batches)} failed: {e}")
+                failed_batches.append(batch_num)
+    
+    if failed_batches:
+        raise RuntimeError(f"{len(failed_batches)} of {len(batches)} batches failed")
     
     print(f"DONE: Successfully upserted all {len(vectors_to_upsert)} vectors")
     
@@ -155,6 +280,22 @@ except Exception as e:
     print(f"ERROR: Failed to upsert vectors: {e}")
     exit(1)
 
+# Remove vectors whose chunk text changed or disappeared since the previous run
+failed_deletes = {}
+if clean_stale:
+    stale_ids = sorted(previous_ids - set(full_texts))
+    print(f"\n  Removing {len(stale_ids)} stale vectors...")
+    for vector_id in stale_ids:
+        try:
+            index.delete_vector(vector_id)
+        except Exception as e:
+            print(f"  WARNING: Failed to remove {vector_id}: {e}")
+            failed_deletes[vector_id] = previous_full_texts[vector_id]
+    print(f"DONE: Removed {len(stale_ids) - len(failed_deletes)} stale vectors")
+
+# Only IDs still in Endee stay listed; failed deletions are retried next run
+write_full_texts({**failed_deletes, **full_texts})
+
 
 
 
@@ -172,7 +313,7 @@ try:
     
     # Search
     results = index.query(
-        vector=query_embedding.tolist(),
+        vector=query_embedding,
         top_k=3
     )
     
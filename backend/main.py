@@ -7,16 +7,30 @@ for homeopathy remedies using Endee vector database.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from functools import lru_cache
 from endee import Endee
 from sentence_transformers import SentenceTransformer
 import google.generativeai as genai
 from dotenv import load_dotenv
+import numpy as np
+import torch
+import asyncio
+import threading
+import hashlib
+import json
 import time
 import logging
 import os
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -44,23 +58,58 @@ app.add_middleware(
 # Global variables for models and clients
 INDEX_NAME = "homeopathy_remedies"
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384
+# "onnx" runs the dynamically quantized INT8 ONNX export through onnxruntime;
+# "torch" keeps the eager fp32 PyTorch model
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "onnx")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MAX_ENTRIES = 10_000
+# Chunks used to build the in-memory corpus matrix; Endee is used when missing
+CHUNKS_FILE = os.getenv(
+    "CHUNKS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "remedy_chunks.json")
+)
+# Precomputed chunk embeddings keyed by content hash, written by ingest.py next
+# to the chunks file; the file name carries the model that produced them
+EMBEDDINGS_CACHE_FILE = os.getenv(
+    "EMBEDDINGS_CACHE_FILE",
+    os.path.join(
+        os.path.dirname(CHUNKS_FILE),
+        f"embeddings_{EMBEDDING_MODEL.replace('/', '__')}.npz"
+    )
+)
+# Chunk texts keyed by vector ID, written by ingest.py (not stored in Endee)
+FULL_TEXTS_FILE = os.getenv(
+    "FULL_TEXTS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "full_texts.json")
+)
 
 endee_client = None
 embedding_model = None
 index = None
 gemini_model = None
+corpus_matrix = None  # (N, 384) int8 per-row quantized (fp32 without numba)
+corpus_scales = None  # (N,) float32 dequantization scale per row
+corpus_meta = []      # per-row id + metadata, aligned with corpus_matrix
+full_texts = {}       # vector id -> full chunk text
 GEMINI_MODEL_FALLBACKS = [
     "models/gemini-flash-latest",
     "models/gemini-pro-latest",
     "models/gemini-2.0-flash",
     "models/gemini-2.5-flash",
 ]
+# Characters of each source's text included in the chat prompt
+PROMPT_SNIPPET_CHARS = 800
+# Seconds a non-final model gets to produce its first chunk before falling back
+GEMINI_FIRST_TOKEN_TIMEOUT = float(os.getenv("GEMINI_FIRST_TOKEN_TIMEOUT", "3.0"))
 
 
 # Pydantic models for request/response validation
 class SearchRequest(BaseModel):
     query: str
     top_k: Optional[int] = 5
+    include_full_text: Optional[bool] = True
 
 class ChatRequest(BaseModel):
     query: str
@@ -95,10 +144,318 @@ class StatsResponse(BaseModel):
     status: str
 
 
+class SemanticCache:
+    """
+    In-process cache keyed by query embedding similarity
+
+    Embeddings are L2-normalized, so a single matrix-vector product gives the
+    cosine similarity against every cached query. A lookup hits when the best
+    match reaches the threshold. Rows live in a preallocated ring buffer: a
+    new entry overwrites a near-duplicate row or, once full, the least
+    recently used row in place.
+    """
+
+    def __init__(self, dimension=EMBEDDING_DIMENSION,
+                 threshold=SEMANTIC_CACHE_THRESHOLD,
+                 max_entries=SEMANTIC_CACHE_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embs = np.zeros((max_entries, dimension), dtype=np.float32)
+        self.entries = [None] * max_entries
+        self.last_used = np.zeros(max_entries, dtype=np.int64)
+        self.size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def _best_match(self, q):
+        """Index and similarity of the closest cached row (lock must be held)"""
+        sims = self.embs[:self.size] @ q
+        i = int(sims.argmax())
+        return i, sims[i]
+
+    def lookup(self, query_embedding, accept=None):
+        """
+        Return the cached value for a near-duplicate query, or None
+
+        accept, if given, is called with the cached value and can reject it
+        (e.g. an entry holding fewer results than requested).
+        """
+        q = np.asarray(query_embedding, dtype=np.float32)
+        with self._lock:
+            if self.size == 0:
+                return None
+            i, sim = self._best_match(q)
+            if sim < self.threshold:
+                return None
+            value = self.entries[i]
+            if accept is not None and not accept(value):
+                return None
+            self._tick += 1
+            self.last_used[i] = self._tick
+            return value
+
+    def add(self, query_embedding, value):
+        """Store a value for a query embedding, reusing a near-duplicate or the LRU row"""
+        q = np.asarray(query_embedding, dtype=np.float32)
+        with self._lock:
+            row = None
+            if self.size:
+                i, sim = self._best_match(q)
+                if sim >= self.threshold:
+                    row = i
+            if row is None:
+                if self.size < self.max_entries:
+                    row = self.size
+                    self.size += 1
+                else:
+                    row = int(self.last_used.argmin())
+            self._tick += 1
+            self.embs[row] = q
+            self.entries[row] = value
+            self.last_used[row] = self._tick
+
+
+# One search cache for every top_k: entries hold (top_k, results) and serve
+# any request for at most that many results
+search_cache = SemanticCache()
+chat_cache = SemanticCache()
+
+
+def chunk_hash(text):
+    """Content hash of a chunk; vector IDs are chunk_<hash>, matching ingest.py"""
+    return hashlib.blake2b(text.encode('utf-8')).hexdigest()[:16]
+
+
+def load_local_corpus(chunks_file, embeddings_file=None, model=None):
+    """
+    Load the remedy chunks into a row-normalized in-memory matrix
+    
+    The corpus is small enough (1326 x 384; ~2 MB as fp32, ~0.5 MB once
+    quantized for the numba kernel) that brute-force inner product beats an
+    HTTP round-trip to Endee. IDs and metadata mirror what ingest.py upserts; chunk texts are added to full_texts.
+    
+    Embeddings come from ingest.py's embeddings cache when it covers every
+    chunk, otherwise they are encoded with the given model, which should be
+    the fp32 PyTorch model so both paths produce the same vectors.
+    
+    Returns:
+        (matrix, meta), or (None, []) if the chunks file is unavailable or
+        embeddings are missing and no model was given
+    """
+    if not os.path.exists(chunks_file):
+        logger.warning(f"Chunks file not found at {chunks_file}, searching via Endee")
+        return None, []
+    
+    with open(chunks_file, 'r', encoding='utf-8') as f:
+        chunks = json.load(f)
+    hashes = [chunk_hash(chunk['text']) for chunk in chunks]
+    
+    cached = {}
+    if embeddings_file and os.path.exists(embeddings_file):
+        with np.load(embeddings_file) as f:
+            cached = {h: f[h] for h in f.files}
+    
+    if all(h in cached for h in hashes):
+        logger.info(f"Building local corpus matrix from {embeddings_file}...")
+        matrix = np.stack([cached[h] for h in hashes]).astype(np.float32)
+    elif model is None:
+        return None, []
+    else:
+        logger.info(f"Building local corpus matrix from {chunks_file}...")
+        matrix = model.encode(
+            [chunk['text'] for chunk in chunks],
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32)
+    matrix = np.ascontiguousarray(matrix)
+    
+    meta = []
+    for chunk, h in zip(chunks, hashes):
+        chunk_id = f"chunk_{h}"
+        meta.append({
+            "id": chunk_id,
+            "meta": {
+                "remedy_name": chunk['remedy_name'],
+                "remedy_index": chunk.get('remedy_index', 0),
+                "text_preview": chunk['text'][:300] + "..."
+            }
+        })
+        full_texts[chunk_id] = chunk['text']
+    
+    logger.info(f"Local corpus ready: {matrix.shape[0]} vectors")
+    return matrix, meta
+
+
+if NUMBA_AVAILABLE:
+    # Serial on purpose: the kernel is called concurrently from to_thread
+    # workers, and at this corpus size a parallel fork/join costs more than it saves
+    @njit(cache=True, fastmath=True)
+    def _topk_kernel(M, scales, q, k):
+        """Fused dot-product + top-k; keeps a small sorted buffer instead of sorting all scores"""
+        n, d = M.shape
+        # Cosine scores are >= -1, so any finite sentinel below that works
+        top_idx = np.full(k, -1, dtype=np.int64)
+        top_sim = np.full(k, np.float32(-3.0e38), dtype=np.float32)
+        for i in range(n):
+            s = np.float32(0.0)
+            for j in range(d):
+                s += np.float32(M[i, j]) * q[j]
+            s *= scales[i]
+            if s > top_sim[k - 1]:
+                pos = k - 1
+                while pos > 0 and top_sim[pos - 1] < s:
+                    top_sim[pos] = top_sim[pos - 1]
+                    top_idx[pos] = top_idx[pos - 1]
+                    pos -= 1
+                top_sim[pos] = s
+                top_idx[pos] = i
+        return top_idx, top_sim
+
+
+def _topk_numpy(M, scales, q, k):
+    """
+    NumPy top-k used when numba is not installed
+    
+    Expects the fp32 matrix from prepare_corpus_matrix: NumPy would upcast an
+    int8 matrix to a full fp32 temporary on every query, so this path does
+    not benefit from quantization.
+    """
+    sims = (M @ q) * scales
+    idx = np.argpartition(-sims, k - 1)[:k]
+    idx = idx[np.argsort(-sims[idx])]
+    return idx, sims[idx]
+
+
+def quantize_int8(matrix):
+    """
+    Per-row symmetric INT8 quantization
+    
+    Returns:
+        (int8 matrix, float32 per-row scales) with matrix ~= q * scales[:, None]
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+
+def prepare_corpus_matrix(matrix):
+    """
+    Pick the in-memory corpus layout for the available top-k kernel
+    
+    Returns:
+        (int8 matrix, scales) for the numba kernel, or the fp32 matrix with
+        unit scales for the NumPy fallback
+    """
+    if NUMBA_AVAILABLE:
+        return quantize_int8(matrix)
+    return matrix, np.ones(matrix.shape[0], dtype=np.float32)
+
+
+def search_local_corpus(query_embedding, top_k):
+    """Exact top_k search over the local corpus, shaped like Endee query results"""
+    q = np.ascontiguousarray(query_embedding, dtype=np.float32)
+    k = min(top_k, corpus_matrix.shape[0])
+    topk = _topk_kernel if NUMBA_AVAILABLE else _topk_numpy
+    idx, sims = topk(corpus_matrix, corpus_scales, q, k)
+    return [
+        {**corpus_meta[i], "similarity": float(sim)}
+        for i, sim in zip(idx, sims)
+    ]
+
+
+def load_embedding_model():
+    """
+    Load the query embedding model
+    
+    Uses the INT8 ONNX export when EMBEDDING_BACKEND=onnx and falls back to
+    the PyTorch model if onnxruntime/optimum are not installed.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        try:
+            import onnxruntime
+            # torch.set_num_threads does not reach onnxruntime, size its pool explicitly
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = intra_op_threads()
+            model = SentenceTransformer(
+                EMBEDDING_MODEL,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_MODEL_FILE, "session_options": session_options}
+            )
+            logger.info(
+                f"Using ONNX Runtime backend ({ONNX_MODEL_FILE}, "
+                f"{session_options.intra_op_num_threads} intra-op threads)"
+            )
+            return model
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable ({e}), falling back to PyTorch")
+    return load_torch_model()
+
+
+def load_torch_model():
+    """Load the fp32 PyTorch model, the one ingest.py embeds the corpus with"""
+    model = SentenceTransformer(EMBEDDING_MODEL)
+    # inference_mode is cheaper than the no_grad encode() uses internally; it is
+    # thread-local, so wrap encode() itself rather than setting it once at startup
+    model.encode = torch.inference_mode()(model.encode)
+    return model
+
+
+def intra_op_threads():
+    """
+    Intra-op threads per process for torch and onnxruntime:
+    TORCH_NUM_THREADS, else cores / workers
+    """
+    if os.getenv("TORCH_NUM_THREADS"):
+        return int(os.getenv("TORCH_NUM_THREADS"))
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def load_full_texts(full_texts_file):
+    """Load the id -> full text mapping written by ingest.py"""
+    if not os.path.exists(full_texts_file):
+        logger.warning(f"Full texts file not found at {full_texts_file}")
+        return {}
+    with open(full_texts_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def warmup():
+    """
+    Run the query hot path once so the first real request does not pay for
+    lazy kernel initialization or JIT compilation
+    """
+    logger.info("Warming up query path...")
+    embedding_model.encode(["warmup one", "warmup two"], normalize_embeddings=True)
+
+    # embed_query returns a read-only array; numba compiles a separate
+    # specialization for those, so warm with the same kind of input
+    query_embedding = embed_query("warmup")
+    if corpus_matrix is not None:
+        search_local_corpus(query_embedding, 1)
+
+    cache = SemanticCache(max_entries=1)
+    cache.add(query_embedding, None)
+    cache.lookup(query_embedding)
+
+
+# Corpus data is loaded at import time so that, under gunicorn --preload, it is
+# built once in the master and shared copy-on-write by every forked worker.
+# The embedding model and network clients stay per-worker (startup_event):
+# onnxruntime/OpenMP thread pools and HTTP sessions are not fork-safe.
+full_texts.update(load_full_texts(FULL_TEXTS_FILE))
+corpus_matrix, corpus_meta = load_local_corpus(CHUNKS_FILE, EMBEDDINGS_CACHE_FILE)
+if corpus_matrix is not None:
+    corpus_matrix, corpus_scales = prepare_corpus_matrix(corpus_matrix)
+
+
 # Startup event - initialize models
 @app.on_event("startup")
 async def startup_event():
     global endee_client, embedding_model, index, gemini_model
+    global corpus_matrix, corpus_scales, corpus_meta
     
     try:
         logger.info("Initializing Endee client...")
@@ -114,12 +471,33 @@ async def startup_event():
         endee_client.base_url = new_url
         logger.info(f"Connected to Endee at: {new_url}")
         
-        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}...")
-        embedding_model = SentenceTransformer(EMBEDDING_MODEL)
-        
-        logger.info(f"Getting index: {INDEX_NAME}...")
+        # Fetch the index before loading the model so an unreachable Endee
+        # fails fast without first pulling the model into memory
         logger.info(f"Getting index: {INDEX_NAME}...")
         index = endee_client.get_index(name=INDEX_NAME)
+        
+        # Split the cores between workers to avoid oversubscription; the ONNX
+        # session gets the same size in load_embedding_model
+        torch.set_num_threads(intra_op_threads())
+        logger.info(f"Using {torch.get_num_threads()} torch intra-op threads")
+
+        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}...")
+        embedding_model = load_embedding_model()
+
+        if corpus_matrix is None and os.path.exists(CHUNKS_FILE):
+            # No precomputed embeddings: encode the corpus in this worker. The
+            # corpus always uses the fp32 PyTorch model, matching ingest.py's
+            # cache and the vectors in Endee, whatever backend serves queries
+            if getattr(embedding_model, "backend", "torch") == "torch":
+                corpus_model = embedding_model
+            else:
+                corpus_model = load_torch_model()
+            corpus_matrix, corpus_meta = load_local_corpus(CHUNKS_FILE, model=corpus_model)
+            del corpus_model
+            if corpus_matrix is not None:
+                corpus_matrix, corpus_scales = prepare_corpus_matrix(corpus_matrix)
+
+        warmup()
 
         logger.info("Initializing Gemini...")
         api_key = os.getenv("GEMINI_API_KEY")
@@ -133,10 +511,8 @@ async def startup_event():
         logger.info("DONE: Backend initialized successfully")
     except Exception as e:
         logger.error(f"ERROR: Failed to initialize backend: {e}")
-        # raise  <-- Commented out to prevent crash
-        logger.error("Keeping container alive for debugging/ingestion...")
-        while True:
-            time.sleep(60)
+        # Fail fast: the process exits and the supervisor (compose restart policy) restarts it
+        raise
 
 
 # Health check endpoint
@@ -152,8 +528,67 @@ async def root():
     }
 
 
+@lru_cache(maxsize=4096)
+def _encode_cached(query):
+    """Exact-match cache: repeated queries skip the tokenizer and transformer"""
+    embedding = np.asarray(
+        embedding_model.encode(query, normalize_embeddings=True),
+        dtype=np.float32
+    )
+    # Shared between requests, so make sure nobody mutates it in place
+    embedding.setflags(write=False)
+    return embedding
+
+
+def embed_query(query):
+    """Encode a query into an L2-normalized embedding"""
+    return _encode_cached(query)
+
+
+def retrieve_remedies(query_embedding, top_k):
+    """
+    Retrieve the top_k remedies for a query embedding as RemedyResult-shaped dicts
+    
+    Near-duplicate queries are served from the semantic cache without
+    touching Endee.
+    """
+    cached = search_cache.lookup(query_embedding, accept=lambda entry: entry[0] >= top_k)
+    if cached is not None:
+        logger.info("Semantic cache hit for search")
+        return cached[1][:top_k]
+    
+    if corpus_matrix is not None:
+        # Brute-force over the in-memory corpus, no network round-trip
+        results = search_local_corpus(query_embedding, top_k)
+    else:
+        # Search Endee index (the SDK takes the ndarray as-is, no list conversion)
+        results = index.query(
+            vector=query_embedding,
+            top_k=top_k
+        )
+    
+    # Format results as plain dicts shaped like RemedyResult (no per-item validation)
+    remedy_results = []
+    for result in results:
+        meta = result.get('meta', {})
+        remedy_results.append({
+            "id": result.get('id', ''),
+            "remedy_name": meta.get('remedy_name', 'Unknown'),
+            "alternative_names": meta.get('alternative_names', ''),
+            "similarity": result.get('similarity', 0.0),
+            "text_preview": meta.get('text_preview', ''),
+            # Older indexes still carry full_text in Endee metadata
+            "full_text": full_texts.get(result.get('id', ''), meta.get('full_text', ''))
+        })
+    
+    search_cache.add(query_embedding, (top_k, remedy_results))
+    return remedy_results
+
+
 # Search endpoint
-@app.post("/api/search", response_model=SearchResponse)
+# Returns a plain dict (response_model=None) to skip re-validating every result;
+# SearchResponse still documents the schema
+@app.post("/api/search", response_model=None, responses={200: {"model": SearchResponse}})
 async def search_remedies(request: SearchRequest):
     """
     Semantic search for homeopathy remedies
@@ -176,40 +611,22 @@ async def search_remedies(request: SearchRequest):
         
         logger.info(f"Search query: '{request.query}' (top_k={request.top_k})")
         
-        # Generate query embedding
-        query_embedding = embedding_model.encode(
-            request.query,
-            normalize_embeddings=True
-        )
-        
-        # Search Endee index
-        results = index.query(
-            vector=query_embedding.tolist(),
-            top_k=request.top_k
-        )
+        # Generate query embedding and retrieve off the event loop
+        query_embedding = await asyncio.to_thread(embed_query, request.query)
         
-        # Format results
-        remedy_results = []
-        for result in results:
-            meta = result.get('meta', {})
-            remedy_results.append(RemedyResult(
-                id=result.get('id', ''),
-                remedy_name=meta.get('remedy_name', 'Unknown'),
-                alternative_names=meta.get('alternative_names', ''),
-                similarity=result.get('similarity', 0.0),
-                text_preview=meta.get('text_preview', ''),
-                full_text=meta.get('full_text', '')
-            ))
+        remedy_results = await asyncio.to_thread(retrieve_remedies, query_embedding, request.top_k)
+        if not request.include_full_text:
+            remedy_results = [{**r, "full_text": None} for r in remedy_results]
         
         query_time = (time.time() - start_time) * 1000  # Convert to ms
         
         logger.info(f"Found {len(remedy_results)} results in {query_time:.2f}ms")
         
-        return SearchResponse(
-            results=remedy_results,
-            query_time_ms=round(query_time, 2),
-            total_results=len(remedy_results)
-        )
+        return {
+            "results": remedy_results,
+            "query_time_ms": round(query_time, 2),
+            "total_results": len(remedy_results)
+        }
         
     except HTTPException:
         raise
@@ -257,30 +674,15 @@ async def get_stats():
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 
-# Chat endpoint (RAG)
-@app.post("/api/chat", response_model=ChatResponse)
-async def chat_with_remedies(request: ChatRequest):
-    """
-    RAG Chat endpoint using Gemini
-    """
-    try:
-        if not gemini_model:
-            raise HTTPException(status_code=503, detail="Gemini model not initialized. Check server logs/API key.")
+def build_chat_prompt(query, sources):
+    """Build the Gemini prompt from the retrieved remedies"""
+    # text_preview is a prefix of full_text, so send one snippet per source
+    context_text = "".join([
+        f"Remedy {idx+1}: {res['remedy_name']}\n{(res['full_text'] or res['text_preview'])[:PROMPT_SNIPPET_CHARS]}\n---\n"
+        for idx, res in enumerate(sources)
+    ])
 
-        # 1. Search for relevant remedies
-        search_request = SearchRequest(query=request.query, top_k=5)
-        search_res = await search_remedies(search_request) # Re-use search logic effectively
-        
-        # 2. Construct Prompt context
-        context_text = ""
-        for idx, res in enumerate(search_res.results):
-            context_text += f"Remedy {idx+1}: {res.remedy_name}\n"
-            context_text += f"{res.text_preview}\n"
-            if res.full_text:
-                 context_text += f"Full Text Snippet: {res.full_text[:500]}...\n"
-            context_text += "---\n"
-
-        prompt = f"""
+    return f"""
         You are a helpful Homeopathy Assistant. Use ONLY the context below.
 
         Task:
@@ -294,28 +696,104 @@ async def chat_with_remedies(request: ChatRequest):
         Context:
         {context_text}
 
-        User Question: {request.query}
+        User Question: {query}
         """
 
-        # 3. Generate Answer with model fallbacks
-        last_error = None
-        response = None
-        for model_name in GEMINI_MODEL_FALLBACKS:
-            try:
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt)
-                break
-            except Exception as e:
-                last_error = e
-                continue
 
-        if response is None:
-            raise HTTPException(status_code=500, detail=f"Chat generation failed: {last_error}")
+async def _start_gemini_stream(model_name, prompt):
+    """Start a streamed generation and wait for its first chunk"""
+    model = genai.GenerativeModel(model_name)
+    response = await model.generate_content_async(prompt, stream=True)
+    stream = aiter(response)
+    return await anext(stream), stream
+
+
+async def stream_gemini(prompt):
+    """
+    Stream answer text from Gemini with model fallbacks
+    
+    Each model except the last gets GEMINI_FIRST_TOKEN_TIMEOUT seconds to
+    produce its first chunk before the next fallback is tried, so a slow or
+    failing model does not add its full timeout to the response. The last
+    fallback runs without a hard timeout so a slow answer still beats a 500.
+    """
+    last_error = None
+    for i, model_name in enumerate(GEMINI_MODEL_FALLBACKS):
+        is_last = i == len(GEMINI_MODEL_FALLBACKS) - 1
+        try:
+            first, stream = await asyncio.wait_for(
+                _start_gemini_stream(model_name, prompt),
+                timeout=None if is_last else GEMINI_FIRST_TOKEN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            last_error = f"{model_name} timed out"
+            logger.warning(f"Gemini {model_name} timed out, trying next model")
+            continue
+        except Exception as e:
+            last_error = e
+            continue
+
+        yield first.text
+        async for chunk in stream:
+            yield chunk.text
+        return
+
+    raise RuntimeError(f"All Gemini models failed: {last_error}")
+
+
+async def prepare_chat(request):
+    """
+    Validate a chat request and retrieve its sources
+    
+    Returns:
+        (query_embedding, sources, cached answer or None)
+    """
+    if not gemini_model:
+        raise HTTPException(status_code=503, detail="Gemini model not initialized. Check server logs/API key.")
+
+    if not request.query or len(request.query.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
+    # Near-duplicate questions reuse the cached answer
+    query_embedding = await asyncio.to_thread(embed_query, request.query)
+    cached = chat_cache.lookup(query_embedding)
+    if cached is not None:
+        logger.info("Semantic cache hit for chat")
+        answer, sources = cached
+        return query_embedding, sources, answer
+
+    sources = await asyncio.to_thread(retrieve_remedies, query_embedding, 5)
+    return query_embedding, sources, None
+
+
+# Chat endpoint (RAG)
+# Returns a plain dict like /api/search; ChatResponse documents the schema
+@app.post("/api/chat", response_model=None, responses={200: {"model": ChatResponse}})
+async def chat_with_remedies(request: ChatRequest):
+    """
+    RAG Chat endpoint using Gemini
+    """
+    try:
+        # 1. Search for relevant remedies
+        query_embedding, sources, answer = await prepare_chat(request)
+        if answer is not None:
+            return {"answer": answer, "sources": sources}
+
+        # 2. Construct Prompt context
+        prompt = build_chat_prompt(request.query, sources)
+
+        # 3. Generate Answer with model fallbacks
+        try:
+            answer = "".join([text async for text in stream_gemini(prompt)])
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=f"Chat generation failed: {e}")
         
-        return ChatResponse(
-            answer=response.text,
-            sources=search_res.results
-        )
+        chat_cache.add(query_embedding, (answer, sources))
+        
+        return {
+            "answer": answer,
+            "sources": sources
+        }
 
     except HTTPException:
         raise
@@ -324,6 +802,46 @@ async def chat_with_remedies(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat generation failed: {str(e)}")
 
 
+# Streaming chat endpoint (RAG)
+@app.post("/api/chat/stream")
+async def chat_with_remedies_stream(request: ChatRequest):
+    """
+    Streaming RAG Chat endpoint using Gemini
+    
+    Returns newline-delimited JSON: a {"sources": [...]} prelude, then
+    {"delta": "..."} lines as the answer is generated, or {"error": "..."}
+    if generation fails.
+    """
+    try:
+        query_embedding, sources, cached_answer = await prepare_chat(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Chat error: {e}")
+        raise HTTPException(status_code=500, detail=f"Chat generation failed: {str(e)}")
+
+    async def events():
+        yield json.dumps({"sources": sources}) + "\n"
+
+        if cached_answer is not None:
+            yield json.dumps({"delta": cached_answer}) + "\n"
+            return
+
+        parts = []
+        try:
+            async for text in stream_gemini(build_chat_prompt(request.query, sources)):
+                parts.append(text)
+                yield json.dumps({"delta": text}) + "\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield json.dumps({"error": f"Chat generation failed: {e}"}) + "\n"
+            return
+
+        chat_cache.add(query_embedding, ("".join(parts), sources))
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 # Run with: uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000
 if __name__ == "__main__":
     import uvicorn
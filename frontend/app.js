@@ -118,12 +118,7 @@ function displayResults(data) {
     }
 
     // 1. Show Answer
-    if (data.answer) {
-        // Simple markdown-ish bold replacement
-        let formattedAnswer = data.answer.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
-        answerText.innerHTML = formattedAnswer;
-        answerSection.style.display = 'block';
-    }
+    displayAnswer(data.answer);
 
     // 2. Create remedy cards (Sources)
     sources.forEach((remedy, index) => {
@@ -135,10 +130,20 @@ function displayResults(data) {
     resultsSection.style.display = 'block';
 }
 
+function displayAnswer(answer) {
+    if (!answer) {
+        return;
+    }
+    // Simple markdown-ish bold replacement
+    let formattedAnswer = answer.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
+    answerText.innerHTML = formattedAnswer;
+    answerSection.style.display = 'block';
+}
+
 // ===== API Calls =====
 async function fetchChat(query) {
     try {
-        const response = await fetch(`${API_BASE_URL}/api/chat`, {
+        const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -158,7 +163,41 @@ async function fetchChat(query) {
             throw new Error(errorData.detail || 'Chat failed');
         }
 
-        return await response.json();
+        // Newline-delimited JSON: sources first, then answer deltas
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const data = { answer: '', sources: [] };
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+
+            for (const line of lines) {
+                if (!line.trim()) {
+                    continue;
+                }
+                const event = JSON.parse(line);
+                if (event.error) {
+                    throw new Error(event.error);
+                }
+                if (event.sources) {
+                    data.sources = event.sources;
+                    displayResults(data);
+                }
+                if (event.delta) {
+                    data.answer += event.delta;
+                    displayAnswer(data.answer);
+                }
+            }
+        }
+
+        return data;
     } catch (error) {
         // Network or parsing error -> fallback
         return null;